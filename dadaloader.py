@@ -1,18 +1,25 @@
 import sys
 import os
+import io
+import re
 import time
 import logging
+import json
+import socket
+import secrets
+import functools
 import sqlite3
 import shutil
 import zipfile
 import requests
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict
 import asyncio
 import subprocess
+import threading
+import queue
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import pyperclip
-import validators
 from urllib.parse import urlparse
 
 # Setup logging
@@ -22,8 +29,23 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# Tk window geometry string, e.g. "800x600+120+-4"
+GEOMETRY_RE = re.compile(r"(\d+)x(\d+)\+?(-?\d+)\+?(-?\d+)")
+
+# http(s) URL with a host and no whitespace
+URL_RE = re.compile(r"https?://[^\s/$.?#]\S*", re.I)
+
+def is_valid_url(url: str) -> bool:
+    return URL_RE.fullmatch(url) is not None
+
 class DownloadItem:
     """Represents a single download task."""
+    # Fixed slots keep items compact and make the per-poll attribute writes cheaper
+    __slots__ = (
+        "url", "save_path", "file_size", "downloaded", "status", "speed", "eta", "progress",
+        "is_paused", "is_stopped", "gid", "start_time", "task"
+    )
+
     def __init__(self, url: str, save_path: str, file_size: int = 0):
         self.url = url
         self.save_path = save_path
@@ -35,63 +57,103 @@ class DownloadItem:
         self.progress = 0.0
         self.is_paused = False
         self.is_stopped = False
-        self.process = None  # For aria2c subprocess
+        self.gid = None  # aria2c download GID
         self.start_time = None
-        self.task = None  # For asyncio task
+        self.task = None  # concurrent.futures.Future of the download coroutine
         logging.debug(f"Created DownloadItem for {url}")
 
 class DatabaseManager:
     """Handles SQLite database operations for download history."""
+    # Statements are kept as constants so sqlite3's statement cache always hits
+    _SQL_INSERT = "INSERT INTO downloads (url, save_path, file_size, status, progress, downloaded, is_paused) VALUES (?, ?, ?, ?, ?, ?, ?)"
+    _SQL_UPDATE = "UPDATE downloads SET progress = ?, status = ?, downloaded = ?, is_paused = ? WHERE id = ?"
+    _SQL_SELECT = "SELECT id, url, save_path, file_size, status, progress, downloaded, is_paused FROM downloads"
+    _SQL_DELETE = "DELETE FROM downloads WHERE id = ?"
+
     def __init__(self, db_name: str = "async_dadaloader.db"):
-        self.conn = sqlite3.connect(db_name)
+        # Autocommit mode; transactions are opened explicitly only when batching
+        self.conn = sqlite3.connect(db_name, isolation_level=None, check_same_thread=False, cached_statements=256)
+        # WAL + synchronous=NORMAL: progress updates commit without waiting on an fsync
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA journal_size_limit=6144000")
+        self.conn.execute("PRAGMA cache_size=-20000")
         self.create_tables()
 
     def create_tables(self):
-        with self.conn:
-            self.conn.execute("""
-                CREATE TABLE IF NOT EXISTS downloads (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    url TEXT NOT NULL,
-                    save_path TEXT NOT NULL,
-                    file_size INTEGER,
-                    status TEXT,
-                    progress REAL,
-                    downloaded INTEGER DEFAULT 0,
-                    is_paused INTEGER DEFAULT 0
-                )
-            """)
-
-    def add_download(self, download: DownloadItem):
-        with self.conn:
-            self.conn.execute(
-                "INSERT INTO downloads (url, save_path, file_size, status, progress, downloaded, is_paused) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (download.url, download.save_path, download.file_size, download.status, download.progress, download.downloaded, int(download.is_paused))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS downloads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                save_path TEXT NOT NULL,
+                file_size INTEGER,
+                status TEXT,
+                progress REAL,
+                downloaded INTEGER DEFAULT 0,
+                is_paused INTEGER DEFAULT 0
             )
+        """)
+
+    def add_download(self, download: DownloadItem) -> int:
+        """Insert a download and return its row ID."""
+        cursor = self.conn.execute(
+            self._SQL_INSERT,
+            (download.url, download.save_path, download.file_size, download.status, download.progress, download.downloaded, int(download.is_paused))
+        )
+        return cursor.lastrowid
 
     def update_download(self, download_id: int, progress: float, status: str, downloaded: int, is_paused: bool):
-        with self.conn:
-            self.conn.execute(
-                "UPDATE downloads SET progress = ?, status = ?, downloaded = ?, is_paused = ? WHERE id = ?",
-                (progress, status, downloaded, int(is_paused), download_id)
-            )
+        self.conn.execute(self._SQL_UPDATE, (progress, status, downloaded, int(is_paused), download_id))
+
+    def update_downloads(self, rows: List[Tuple]):
+        """Apply many (progress, status, downloaded, is_paused, id) updates in one transaction."""
+        self.conn.execute("BEGIN")
+        try:
+            self.conn.executemany(self._SQL_UPDATE, rows)
+        except sqlite3.Error:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
 
     def get_downloads(self) -> List[Tuple]:
-        with self.conn:
-            return self.conn.execute("SELECT id, url, save_path, file_size, status, progress, downloaded, is_paused FROM downloads").fetchall()
+        return self.conn.execute(self._SQL_SELECT).fetchall()
 
     def delete_download(self, download_id: int):
-        with self.conn:
-            self.conn.execute("DELETE FROM downloads WHERE id = ?", (download_id,))
+        self.conn.execute(self._SQL_DELETE, (download_id,))
 
 class AsyncDownloader:
-    """Handles download tasks using aria2c."""
+    """Handles download tasks through a single aria2c process driven over JSON-RPC."""
+    MAX_CONCURRENT_DOWNLOADS = 1000
+    POLL_INTERVAL = 0.5  # Seconds between status polls
+    _STATUS_KEYS = ["gid", "status", "totalLength", "completedLength", "downloadSpeed", "errorMessage"]
+    _RPC_HEADERS = {"Content-Type": "application/json"}
+
     def __init__(self, window):
         self.window = window
         self.overhead_factor = 0.1  # Assume 10% network overhead
-        self.aria2c_path = self.ensure_aria2c()
+        self.aria2c_path = None  # Resolved off the Tk thread before the first download
+        self._rpc_url = None  # Set once the aria2c RPC process is started on a free port
+        self._rpc_secret = secrets.token_hex(16)
+        self._rpc_token = f"token:{self._rpc_secret}"
+        # Shared by the aria2c bootstrap download and the RPC calls
+        self._http = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, max_retries=3)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        self._daemon = None  # aria2c RPC process, started on first download
+        self._daemon_lock = None
+        self._poller = None
+        self._poll_gids: Tuple[str, ...] = ()
+        self._poll_body = b""  # Encoded multicall for _poll_gids
+        self._active: Dict[str, Tuple[int, DownloadItem, asyncio.Future]] = {}  # GID -> (download ID, item, outcome)
+        self._removing: set = set()  # GIDs with a forceRemove in flight
 
     def ensure_aria2c(self) -> str:
-        """Ensure aria2c is available, downloading it if necessary."""
+        """Ensure aria2c is available, downloading it if necessary.
+
+        Blocking; runs in the event loop's executor.
+        """
         script_dir = os.path.dirname(os.path.abspath(__file__))
         aria2c_path = os.path.join(script_dir, "aria2c.exe")
         
@@ -102,174 +164,248 @@ class AsyncDownloader:
             return shutil.which("aria2c")
 
         try:
-            messagebox.showinfo("Info", "aria2c not found. Downloading now...")
+            self.window.post(self.window.show_info, "Info", "aria2c not found. Downloading now...")
             logging.info("aria2c not found, initiating download")
             url = "https://github.com/aria2/aria2/releases/download/release-1.37.0/aria2-1.37.0-win-64bit-build1.zip"
-            response = requests.get(url, stream=True)
+            response = self._http.get(url, stream=True, timeout=30)
             response.raise_for_status()
             
-            zip_path = os.path.join(script_dir, "aria2c.zip")
-            with open(zip_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extract("aria2-1.37.0-win-64bit-build1/aria2c.exe", script_dir)
-            
-            os.rename(
-                os.path.join(script_dir, "aria2-1.37.0-win-64bit-build1/aria2c.exe"),
-                aria2c_path
-            )
-            os.remove(zip_path)
-            os.rmdir(os.path.join(script_dir, "aria2-1.37.0-win-64bit-build1"))
-            
+            # Buffer the archive in memory and copy out the one member we need
+            buffer = io.BytesIO()
+            for chunk in response.iter_content(chunk_size=65536):
+                buffer.write(chunk)
+
+            with zipfile.ZipFile(buffer) as zip_ref, \
+                    zip_ref.open("aria2-1.37.0-win-64bit-build1/aria2c.exe") as src, \
+                    open(aria2c_path, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+
             logging.debug(f"Downloaded and extracted aria2c to: {aria2c_path}")
-            messagebox.showinfo("Success", "aria2c downloaded successfully.")
+            self.window.post(self.window.show_info, "Success", "aria2c downloaded successfully.")
             return aria2c_path
         except Exception as e:
             logging.error(f"Failed to download aria2c: {str(e)}")
+            if os.path.isfile(aria2c_path):  # Don't leave a truncated binary behind
+                os.remove(aria2c_path)
             raise RuntimeError(
                 "Failed to download aria2c. Please ensure an internet connection and try again, or manually install aria2c from https://aria2.github.io/."
             )
 
-    def parse_size(self, size_str: str) -> int:
-        """Parse size string (e.g., '1.9GiB') to bytes."""
-        size_str = size_str.strip()
-        units = {'KiB': 1024, 'MiB': 1024**2, 'GiB': 1024**3}
-        for unit, multiplier in units.items():
-            if unit in size_str:
-                value = float(size_str.replace(unit, ""))
-                return int(value * multiplier)
-        return int(float(size_str))
-
-    def parse_eta(self, eta_str: str) -> int:
-        """Parse ETA string (e.g., '15s', '1h38m7') to seconds with error handling."""
-        eta_str = eta_str.replace("ETA:", "").replace("s]", "").strip()
-        total_seconds = 0
+    def _encode_rpc(self, method: str, *params) -> bytes:
+        payload = {"jsonrpc": "2.0", "id": "dadaloader", "method": method, "params": [self._rpc_token, *params]}
+        return json.dumps(payload).encode()
 
-        try:
-            if 'h' in eta_str or 'm' in eta_str:
-                parts = eta_str
-                hours = 0
-                minutes = 0
-                seconds = 0
-
-                if 'h' in parts:
-                    h_part, parts = parts.split('h')
-                    hours = int(h_part) if h_part else 0
-
-                if 'm' in parts:
-                    m_part, parts = parts.split('m')
-                    minutes = int(m_part) if m_part else 0
-
-                seconds = int(parts) if parts else 0
-                total_seconds = (hours * 3600) + (minutes * 60) + seconds
-            else:
-                total_seconds = int(eta_str)
-        except (ValueError, IndexError):
-            logging.error(f"Failed to parse ETA: {eta_str}, defaulting to 0 seconds")
-            total_seconds = 0
-
-        return total_seconds
+    async def _rpc(self, method: str, *params):
+        """Call an aria2c RPC method without blocking the event loop."""
+        return await self._post_rpc(method, self._encode_rpc(method, *params))
 
-    async def download(self, download_id: int, download: DownloadItem):
-        logging.debug(f"Starting download for ID {download_id}: {download.url}")
-        try:
-            cmd = [
+    async def _post_rpc(self, method: str, body: bytes):
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            None, functools.partial(self._http.post, self._rpc_url, data=body, headers=self._RPC_HEADERS, timeout=5)
+        )
+        reply = json.loads(response.content)
+        if "error" in reply:
+            raise RuntimeError(f"aria2c {method} failed: {reply['error'].get('message')}")
+        return reply["result"]
+
+    @staticmethod
+    def _free_port() -> int:
+        """Ask the OS for an unused localhost TCP port."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    async def _ensure_daemon(self):
+        """Start the shared aria2c RPC process and the status poller if they are not running."""
+        if self._daemon_lock is None:
+            self._daemon_lock = asyncio.Lock()
+        async with self._daemon_lock:
+            if self._daemon is not None and self._daemon.returncode is None:
+                return
+            if self.aria2c_path is None:
+                self.aria2c_path = await asyncio.get_running_loop().run_in_executor(None, self.ensure_aria2c)
+            # 6800 is aria2's default and often taken by another aria2c daemon or DADAloader instance
+            port = self._free_port()
+            self._rpc_url = f"http://127.0.0.1:{port}/jsonrpc"
+            self._daemon = await asyncio.create_subprocess_exec(
                 self.aria2c_path,
+                "--enable-rpc",
+                "--rpc-listen-all=false",
+                f"--rpc-listen-port={port}",
+                f"--rpc-secret={self._rpc_secret}",
+                f"--stop-with-process={os.getpid()}",  # Exit together with the application
                 "-x", "16",  # Maximum number of connections per server
                 "-s", "16",  # Number of segments
-                "--dir", os.path.dirname(download.save_path),
-                "--out", os.path.basename(download.save_path),
                 "--continue=true",  # Ensure resume capability
-                "--summary-interval=1",  # Update every second for parsing
-                download.url
-            ]
-            download.start_time = time.time()
-            download.status = "Downloading"
-            self.window.update_download_progress(download_id, download.progress, 0.0, 0.0, "Downloading")
-
-            while not download.is_stopped:
-                process = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                download.process = process
-
-                while True:
-                    line = await process.stdout.readline()
-                    if not line:
-                        break
-                    line = line.decode().strip()
-                    if download.is_stopped:
-                        process.terminate()
-                        download.status = "Stopped"
-                        self.window.update_download_progress(download_id, download.progress, 0.0, 0.0, "Stopped")
-                        break
-                    if download.is_paused:
-                        process.terminate()
-                        download.status = "Paused"
-                        self.window.update_download_progress(download_id, download.progress, 0.0, 0.0, "Paused")
-                        break
-
-                    if "[#" in line and "ETA:" in line:
-                        parts = line.split()
-                        for part in parts:
-                            if "/" in part and "(" in part:
-                                downloaded_str, total_str = part.split("/")
-                                download.downloaded = self.parse_size(downloaded_str)
-                                total_str = total_str.split("(")[0]
-                                download.file_size = self.parse_size(total_str)
-                                if download.file_size > 0:
-                                    download.progress = (download.downloaded / download.file_size) * 100
-                            if "DL:" in part:
-                                speed_str = part.replace("DL:", "")
-                                speed_bytes = self.parse_size(speed_str)
-                                download.speed = (speed_bytes * 8) / (1024 * 1024)
-                            if "ETA:" in part:
-                                download.eta = self.parse_eta(part)
-                        self.window.update_download_progress(download_id, download.progress, download.speed, download.eta, "Downloading")
-
-                await process.wait()
-                if download.is_paused:
-                    while download.is_paused and not download.is_stopped:
-                        await asyncio.sleep(1)
-                    if download.is_stopped:
-                        download.status = "Stopped"
-                        self.window.update_download_progress(download_id, download.progress, 0.0, 0.0, "Stopped")
-                        break
-                    download.status = "Downloading"
-                    self.window.update_download_progress(download_id, download.progress, download.speed, download.eta, "Downloading")
+                # aria2c queues anything past 5 by default; keep every download running in parallel
+                f"--max-concurrent-downloads={self.MAX_CONCURRENT_DOWNLOADS}",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            for _ in range(50):
+                if self._daemon.returncode is not None:
+                    raise RuntimeError(f"aria2c exited during startup (exit code {self._daemon.returncode})")
+                try:
+                    await self._rpc("aria2.getVersion")
+                    break
+                except requests.ConnectionError:
+                    await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("aria2c RPC server did not start")
+            logging.debug(f"Started aria2c RPC server on port {port}")
+            if self._poller is None or self._poller.done():
+                self._poller = asyncio.get_running_loop().create_task(self._poll())
+
+    async def _poll(self):
+        """Fetch the status of every tracked download in one RPC call and dispatch updates."""
+        while True:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            if not self._active:
+                continue
+            if self._daemon.returncode is not None:
+                for gid in list(self._active):
+                    self._finish(gid, "error", "aria2c exited unexpectedly")
+                continue
+            gids = tuple(self._active)
+            if gids != self._poll_gids:
+                # The request body only changes when downloads come and go; reuse it between polls
+                self._poll_gids = gids
+                self._poll_body = self._encode_rpc("system.multicall", [
+                    {"methodName": "aria2.tellStatus", "params": [self._rpc_token, gid, self._STATUS_KEYS]}
+                    for gid in gids
+                ])
+            try:
+                replies = await self._post_rpc("system.multicall", self._poll_body)
+            except Exception as e:
+                logging.error(f"aria2c status poll failed: {str(e)}")
+                continue
+            for gid, reply in zip(gids, replies):
+                if isinstance(reply, dict):  # Fault struct, e.g. GID no longer known to aria2c
+                    self._finish(gid, "error", reply.get("faultString", "Unknown aria2c error"))
                     continue
+                try:
+                    await self._dispatch(reply[0])
+                except Exception as e:
+                    logging.error(f"Failed to update GID {gid}: {str(e)}")
+
+    async def _dispatch(self, status: dict):
+        gid = status["gid"]
+        download_id, download, _ = self._active[gid]
+        state = status["status"]
+
+        if state in ["complete", "error", "removed"]:
+            self._finish(gid, state, status.get("errorMessage", ""))
+        elif download.is_stopped:
+            # forceRemove only flags the download; it is finished above once tellStatus
+            # reports "removed", i.e. after aria2c has actually closed the file
+            if gid not in self._removing:
+                await self._rpc("aria2.forceRemove", gid)
+                self._removing.add(gid)
+        elif download.is_paused:
+            if state != "paused":
+                await self._rpc("aria2.forcePause", gid)
+                self.window.post(self.window.update_download_progress, download_id, download.progress, 0.0, 0.0, "Paused")
+        elif state == "paused":
+            await self._rpc("aria2.unpause", gid)
+            self.window.post(self.window.update_download_progress, download_id, download.progress, download.speed, download.eta, "Downloading")
+        else:
+            total = int(status["totalLength"])
+            completed = int(status["completedLength"])
+            speed_bytes = int(status["downloadSpeed"])
+            download.downloaded = completed
+            if total > 0:
+                download.file_size = total
+                download.progress = (completed / total) * 100
+            download.speed = (speed_bytes * 8) / (1024 * 1024)
+            download.eta = (total - completed) // speed_bytes if speed_bytes else 0
+            self.window.post(self.window.update_download_progress, download_id, download.progress, download.speed, download.eta, "Downloading")
+
+    def _finish(self, gid: str, state: str, message: str):
+        self._removing.discard(gid)
+        _, _, outcome = self._active.pop(gid)
+        if not outcome.done():
+            outcome.set_result((state, message))
 
-                if process.returncode == 0:
-                    download.status = "Completed"
-                    download.progress = 100.0
-                    self.window.update_download_progress(download_id, 100.0, 0.0, 0.0, "Completed")
-                    break
-                else:
-                    download.status = "Error"
-                    self.window.update_download_progress(download_id, download.progress, 0.0, 0.0, "Error")
-                    self.window.show_error("Download failed")
-                    break
+    async def download(self, download_id: int, download: DownloadItem):
+        logging.debug(f"Starting download for ID {download_id}: {download.url}")
+        try:
+            await self._ensure_daemon()
+            if download.is_stopped:  # Deleted or stopped while aria2c was starting
+                download.status = "Stopped"
+                self.window.post(self.window.update_download_progress, download_id, download.progress, 0.0, 0.0, "Stopped")
+                return
+            download.start_time = time.time()
+            download.status = "Downloading"
+            self.window.post(self.window.update_download_progress, download_id, download.progress, 0.0, 0.0, "Downloading")
+
+            options = {
+                "dir": os.path.dirname(download.save_path),
+                "out": os.path.basename(download.save_path)
+            }
+            download.gid = await self._rpc("aria2.addUri", [download.url], options)
+            outcome = asyncio.get_running_loop().create_future()
+            self._active[download.gid] = (download_id, download, outcome)
+            state, message = await outcome
+
+            if state == "complete":
+                download.status = "Completed"
+                download.progress = 100.0
+                if download.file_size > 0:
+                    download.downloaded = download.file_size
+                self.window.post(self.window.update_download_progress, download_id, 100.0, 0.0, 0.0, "Completed")
+            elif state == "removed":
+                download.status = "Stopped"
+                self.window.post(self.window.update_download_progress, download_id, download.progress, 0.0, 0.0, "Stopped")
+            else:
+                download.status = "Error"
+                self.window.post(self.window.update_download_progress, download_id, download.progress, 0.0, 0.0, "Error")
+                self.window.post(self.window.show_error, f"Download failed: {message}" if message else "Download failed")
 
         except Exception as e:
             logging.error(f"Download error for {download.url}: {str(e)}")
             download.status = "Error"
-            self.window.show_error(f"Download failed: {str(e)}")
-            self.window.update_download_progress(download_id, download.progress, 0.0, 0.0, "Error")
+            self.window.post(self.window.show_error, f"Download failed: {str(e)}")
+            self.window.post(self.window.update_download_progress, download_id, download.progress, 0.0, 0.0, "Error")
 
-class FileInfoDialog(tk.Toplevel):
+    async def delete_file(self, download: DownloadItem):
+        """Delete a download's file from disk without blocking the Tk thread."""
+        try:
+            if download.task is not None:
+                await asyncio.wrap_future(download.task)  # Let aria2c drop the download first
+            loop = asyncio.get_running_loop()
+            if await loop.run_in_executor(None, os.path.exists, download.save_path):
+                await loop.run_in_executor(None, os.remove, download.save_path)
+                logging.debug(f"Deleted file {download.save_path}")
+        except Exception as e:
+            logging.error(f"Failed to delete {download.save_path}: {str(e)}")
+
+class CenteredDialogMixin:
+    """Positions a Toplevel dialog over the middle of its parent window."""
+    def _center_over(self, parent):
+        self.update_idletasks()
+        # One geometry query for the parent ("WxH+X+Y") instead of four winfo_* calls
+        match = GEOMETRY_RE.match(parent.geometry())
+        parent_width, parent_height, parent_x, parent_y = (int(group) for group in match.groups())
+        # The dialog is not mapped yet, so its geometry() is still 1x1; use the requested size
+        x = parent_x + (parent_width - self.winfo_reqwidth()) // 2
+        y = parent_y + (parent_height - self.winfo_reqheight()) // 2
+        self.geometry(f"+{x}+{y}")
+
+class FileInfoDialog(CenteredDialogMixin, tk.Toplevel):
     """Dialog to show file information and download progress."""
     def __init__(self, parent, download_id: int, download: DownloadItem):
         super().__init__(parent)
         self.title("File Information")
         self.download_id = download_id
         self.download = download
+        self.parent = parent
         self.init_ui()
         self.update_info()
-        self.center_dialog(parent)
+        self._center_over(parent)
+        # Refreshed by the main window whenever this download reports progress
+        parent.add_progress_callback(download_id, self.update_info)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def init_ui(self):
         frame = ttk.Frame(self)
@@ -303,18 +439,6 @@ class FileInfoDialog(tk.Toplevel):
         style = ttk.Style()
         style.configure("green.Horizontal.TProgressbar", troughcolor='white', background='green')
 
-    def center_dialog(self, parent):
-        self.update_idletasks()
-        parent_width = parent.winfo_width()
-        parent_height = parent.winfo_height()
-        parent_x = parent.winfo_rootx()
-        parent_y = parent.winfo_rooty()
-        dialog_width = self.winfo_reqwidth()
-        dialog_height = self.winfo_reqheight()
-        x = parent_x + (parent_width - dialog_width) // 2
-        y = parent_y + (parent_height - dialog_height) // 2
-        self.geometry(f"+{x}+{y}")
-
     def update_info(self):
         if not self.winfo_exists():
             return
@@ -330,9 +454,11 @@ class FileInfoDialog(tk.Toplevel):
 
         self.time_left_label.config(text=f"{self.download.eta} s")
 
-        self.after(500, self.update_info)
+    def on_close(self):
+        self.parent.remove_progress_callback(self.download_id, self.update_info)
+        self.destroy()
 
-class AddDownloadDialog(tk.Toplevel):
+class AddDownloadDialog(CenteredDialogMixin, tk.Toplevel):
     """Dialog for adding a new download."""
     def __init__(self, parent, url: str = ""):
         super().__init__(parent)
@@ -349,7 +475,8 @@ class AddDownloadDialog(tk.Toplevel):
         self.url_entry.grid(row=0, column=1, padx=5, pady=5)
 
         default_dir = os.path.expanduser("~/Downloads/AsyncDADAloader")
-        os.makedirs(default_dir, exist_ok=True)
+        if not os.path.isdir(default_dir):
+            os.makedirs(default_dir, exist_ok=True)
         default_filename = self.get_unique_filename(url) if url else "download"
         default_path = os.path.join(default_dir, default_filename)
 
@@ -363,7 +490,7 @@ class AddDownloadDialog(tk.Toplevel):
         ttk.Button(frame, text="OK", command=self.on_ok).grid(row=2, column=0, columnspan=3, pady=5)
         ttk.Button(frame, text="Cancel", command=self.on_cancel).grid(row=3, column=0, columnspan=3)
 
-        self.center_dialog(parent)
+        self._center_over(parent)
         self.transient(parent)
         self.grab_set()
 
@@ -374,16 +501,19 @@ class AddDownloadDialog(tk.Toplevel):
 
     def get_unique_filename(self, url: str) -> str:
         base_filename = self.get_filename_from_url(url)
-        name, ext = os.path.splitext(base_filename)
         dir_path = os.path.expanduser("~/Downloads/AsyncDADAloader")
-        counter = 1
-        new_filename = base_filename
-
-        while os.path.exists(os.path.join(dir_path, new_filename)):
-            new_filename = f"{name}_{counter}{ext}"
-            counter += 1
+        try:
+            # One directory read instead of a stat per candidate; normcase for case-insensitive filesystems
+            existing = {os.path.normcase(entry) for entry in os.listdir(dir_path)}
+        except OSError:
+            return base_filename
+        if os.path.normcase(base_filename) not in existing:
+            return base_filename
 
-        return new_filename
+        name, ext = os.path.splitext(base_filename)
+        pattern = re.compile(rf"{re.escape(os.path.normcase(name))}_(\d+){re.escape(os.path.normcase(ext))}")
+        counters = [int(match.group(1)) for match in map(pattern.fullmatch, existing) if match]
+        return f"{name}_{max(counters, default=0) + 1}{ext}"
 
     def browse_save_path(self):
         path = filedialog.asksaveasfilename(initialfile=self.path_entry.get())
@@ -394,28 +524,17 @@ class AddDownloadDialog(tk.Toplevel):
     def on_ok(self):
         url = self.url_entry.get()
         path = self.path_entry.get()
-        if validators.url(url) and path and os.access(os.path.dirname(path), os.W_OK):
+        if is_valid_url(url) and path and os.access(os.path.dirname(path), os.W_OK):
             self.result = (url, path)
             self.destroy()
         else:
-            messagebox.showerror("Error", "Invalid URL or save path")
+            # Deferred so the handler returns before the modal box spins its own event loop
+            self.after_idle(messagebox.showerror, "Error", "Invalid URL or save path")
 
     def on_cancel(self):
         self.result = None
         self.destroy()
 
-    def center_dialog(self, parent):
-        self.update_idletasks()
-        parent_width = parent.winfo_width()
-        parent_height = parent.winfo_height()
-        parent_x = parent.winfo_rootx()
-        parent_y = parent.winfo_rooty()
-        dialog_width = self.winfo_reqwidth()
-        dialog_height = self.winfo_reqheight()
-        x = parent_x + (parent_width - dialog_width) // 2
-        y = parent_y + (parent_height - dialog_height) // 2
-        self.geometry(f"+{x}+{y}")
-
 class AsyncDADAloaderWindow(tk.Tk):
     """Main application window using Tkinter and asyncio."""
     def __init__(self, loop):
@@ -425,13 +544,19 @@ class AsyncDADAloaderWindow(tk.Tk):
         self.loop = loop
         self.db = DatabaseManager()
         self.downloads: dict = {}
+        self._dirty: Dict[int, Tuple] = {}  # Pending DB rows, keyed by download ID
+        self._ui_queue: queue.Queue = queue.Queue()  # Callbacks posted from the asyncio thread
+        self._iid_by_id: Dict[int, str] = {}  # Download ID -> Treeview row
+        self._table_dirty: set = set()  # Download IDs whose row needs refreshing
+        self._progress_cbs: Dict[int, set] = {}  # Download ID -> callbacks run on each progress update
         self.downloader = AsyncDownloader(self)
         self.last_clipboard = pyperclip.paste()
         self.init_ui()
         self.load_downloads()
-        self.after(100, self.process_asyncio)
+        self.after(50, self._drain_ui_queue)
         self.after(100, self.check_clipboard)
         self.after(200, self.update_ui)
+        self.after(1000, self._flush_dirty)
 
     def init_ui(self):
         self.table_frame = ttk.Frame(self)
@@ -487,22 +612,39 @@ class AsyncDADAloaderWindow(tk.Tk):
             if download:
                 FileInfoDialog(self, download_id, download)
 
-    def process_asyncio(self):
-        try:
-            self.loop.call_soon(lambda: None)
-            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
-            self.loop.run_until_complete(asyncio.sleep(0))
-        except RuntimeError:
-            pass
-        self.after(100, self.process_asyncio)
+    def post(self, callback, *args):
+        """Schedule callback(*args) on the Tk thread; safe to call from the asyncio thread."""
+        self._ui_queue.put((callback, args))
+
+    def _drain_ui_queue(self):
+        # Reschedule first: this is the only path from the asyncio thread to the UI
+        self.after(50, self._drain_ui_queue)
+        while True:
+            try:
+                callback, args = self._ui_queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception:
+                logging.exception(f"UI callback {getattr(callback, '__name__', callback)} failed")
 
     def check_clipboard(self):
-        current_clipboard = pyperclip.paste()
-        if current_clipboard != self.last_clipboard and validators.url(current_clipboard):
-            self.last_clipboard = current_clipboard
-            if messagebox.askyesno("URL Detected", f"Download {current_clipboard}?"):
-                self.show_add_download_dialog(current_clipboard)
-        self.after(100, self.check_clipboard)
+        delay = 500
+        try:
+            # Ask Tcl directly: focus_displayof() raises KeyError while a Tcl-built dialog
+            # (tk_messageBox, the file dialog) has focus, since those aren't tkinter widgets
+            if str(self.tk.call("focus", "-displayof", self._w)) in ("", "none"):
+                # Nothing to prompt while the app is in the background; check back less often
+                delay = 1000
+                return
+            current_clipboard = pyperclip.paste()
+            if current_clipboard != self.last_clipboard and is_valid_url(current_clipboard):
+                self.last_clipboard = current_clipboard
+                if messagebox.askyesno("URL Detected", f"Download {current_clipboard}?"):
+                    self.show_add_download_dialog(current_clipboard)
+        finally:
+            self.after(delay, self.check_clipboard)
 
     def show_add_download_dialog(self, url: str = ""):
         dialog = AddDownloadDialog(self, url)
@@ -514,16 +656,16 @@ class AsyncDADAloaderWindow(tk.Tk):
 
     def add_download(self, url: str, save_path: str):
         download = DownloadItem(url, save_path)
-        self.db.add_download(download)
-        download_id = self.db.conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        download_id = self.db.add_download(download)
         self.downloads[download_id] = download
         self.start_download(download_id, download)
 
     def start_download(self, download_id: int, download: DownloadItem):
         download.is_paused = False
         download.is_stopped = False
-        download.task = self.loop.create_task(self.downloader.download(download_id, download))
+        download.task = asyncio.run_coroutine_threadsafe(self.downloader.download(download_id, download), self.loop)
         logging.debug(f"Scheduled download task for ID {download_id}")
+        self._table_dirty.add(download_id)
         self.update_table()
 
     def toggle_download(self):
@@ -537,6 +679,7 @@ class AsyncDADAloaderWindow(tk.Tk):
             download_id = int(self.table.item(item, "text"))
             download = self.downloads[download_id]
             current_status = download.status
+            self._table_dirty.add(download_id)
 
             if current_status in ["Pending", "Stopped", "Error", "Completed"]:
                 download.status = "Downloading"
@@ -549,6 +692,7 @@ class AsyncDADAloaderWindow(tk.Tk):
             elif current_status == "Paused":
                 download.is_paused = False
                 download.status = "Downloading"
+                self._dirty.pop(download_id, None)
                 self.db.update_download(download_id, download.progress, "Downloading", download.downloaded, download.is_paused)
                 self.toggle_button.config(text="Pause")
                 self.status_bar.config(text=f"Resumed download: {os.path.basename(download.save_path)}")
@@ -556,6 +700,7 @@ class AsyncDADAloaderWindow(tk.Tk):
             elif current_status == "Downloading":
                 download.is_paused = True
                 download.status = "Paused"
+                self._dirty.pop(download_id, None)
                 self.db.update_download(download_id, download.progress, "Paused", download.downloaded, download.is_paused)
                 self.toggle_button.config(text="Resume")
                 self.status_bar.config(text=f"Paused download: {os.path.basename(download.save_path)}")
@@ -577,6 +722,8 @@ class AsyncDADAloaderWindow(tk.Tk):
                 download.is_stopped = True
                 download.is_paused = False
                 download.status = "Stopped"
+                self._table_dirty.add(download_id)
+                self._dirty.pop(download_id, None)
                 self.db.update_download(download_id, download.progress, "Stopped", download.downloaded, download.is_paused)
                 self.toggle_button.config(text="Start")
                 self.status_bar.config(text=f"Stopped download: {os.path.basename(download.save_path)}")
@@ -614,12 +761,14 @@ class AsyncDADAloaderWindow(tk.Tk):
             download_id = int(self.table.item(item, "text"))
             download = self.downloads[download_id]
             if messagebox.askyesno("Confirm Delete", f"Delete {os.path.basename(download.save_path)}? (File will be deleted)"):
-                if download.status in ["Downloading", "Paused"]:
+                # Any unfinished task, including one still "Pending" while aria2c starts up
+                if download.task is not None and not download.task.done():
                     download.is_stopped = True
                     download.is_paused = False
-                if os.path.exists(download.save_path):
-                    os.remove(download.save_path)
+                # Removed on the asyncio thread once aria2c has released the file
+                asyncio.run_coroutine_threadsafe(self.downloader.delete_file(download), self.loop)
                 del self.downloads[download_id]
+                self._progress_cbs.pop(download_id, None)
                 self.db.delete_download(download_id)
                 self.status_bar.config(text=f"Deleted download: {os.path.basename(download.save_path)}")
                 logging.debug(f"Deleted download ID {download_id}")
@@ -627,57 +776,96 @@ class AsyncDADAloaderWindow(tk.Tk):
         self.update_toggle_button()
 
     def update_download_progress(self, download_id: int, progress: float, speed: float, eta: float, status: str):
-        if download_id in self.downloads:
-            self.downloads[download_id].progress = progress
-            self.downloads[download_id].speed = speed
-            self.downloads[download_id].eta = eta
-            self.downloads[download_id].status = status
-            self.downloads[download_id].downloaded = int((progress / 100) * self.downloads[download_id].file_size) if self.downloads[download_id].file_size > 0 else self.downloads[download_id].downloaded
-            self.db.update_download(download_id, progress, status, self.downloads[download_id].downloaded, self.downloads[download_id].is_paused)
+        download = self.downloads.get(download_id)
+        if download is not None:
+            # downloaded/file_size are already exact byte counts from aria2c; no need to derive them from progress
+            download.progress = progress
+            download.speed = speed
+            download.eta = eta
+            download.status = status
+            self._table_dirty.add(download_id)
+            self._dirty[download_id] = (progress, status, download.downloaded, int(download.is_paused), download_id)
+            if status in ["Completed", "Error", "Stopped", "Paused"]:
+                self.flush_dirty()
             logging.debug(f"Updated progress for ID {download_id}: {progress}%, Status: {status}, Speed: {speed} Mb/s")
+            for callback in tuple(self._progress_cbs.get(download_id, ())):
+                callback()
             self.update_toggle_button()
 
+    def add_progress_callback(self, download_id: int, callback):
+        self._progress_cbs.setdefault(download_id, set()).add(callback)
+
+    def remove_progress_callback(self, download_id: int, callback):
+        callbacks = self._progress_cbs.get(download_id)
+        if callbacks:
+            callbacks.discard(callback)
+            if not callbacks:
+                del self._progress_cbs[download_id]
+
+    def flush_dirty(self):
+        """Write all pending progress updates to the database in a single transaction."""
+        if self._dirty:
+            rows = list(self._dirty.values())
+            self._dirty.clear()
+            self.db.update_downloads(rows)
+
+    def _flush_dirty(self):
+        self.flush_dirty()
+        self.after(1000, self._flush_dirty)
+
+    def show_info(self, title: str, message: str):
+        self.after_idle(messagebox.showinfo, title, message)
+
     def show_error(self, message: str):
-        messagebox.showerror("Download Error", message)
+        # Deferred so the caller (e.g. the UI queue drain) returns before the modal box opens
+        self.after_idle(messagebox.showerror, "Download Error", message)
         logging.error(f"Error displayed: {message}")
         self.status_bar.config(text="Error occurred, check log for details")
         self.update_toggle_button()
 
     def load_downloads(self):
-        for download in self.db.get_downloads():
-            download_id, url, save_path, file_size, status, progress, downloaded, is_paused = download
-            self.downloads[download_id] = DownloadItem(url, save_path, file_size)
-            self.downloads[download_id].status = status
-            self.downloads[download_id].progress = progress
-            self.downloads[download_id].downloaded = downloaded
-            self.downloads[download_id].is_paused = bool(is_paused)
-        self.update_table()
+        rows = []
+        for download_id, url, save_path, file_size, status, progress, downloaded, is_paused in self.db.get_downloads():
+            download = DownloadItem(url, save_path, file_size)
+            download.status = status
+            download.progress = progress
+            download.downloaded = downloaded
+            download.is_paused = bool(is_paused)
+            self.downloads[download_id] = download
+            rows.append((download_id, self.row_values(download)))
+
+        # Hide the columns while inserting so Tk does not redraw after every row
+        self.table.configure(displaycolumns=())
+        for download_id, values in rows:
+            self._iid_by_id[download_id] = self.table.insert("", tk.END, iid=str(download_id), text=str(download_id), values=values)
+        self.table.configure(displaycolumns="#all")
+
+    def row_values(self, download: DownloadItem) -> Tuple:
+        size_mb = f"{download.file_size / (1024 * 1024):.2f}" if download.file_size else "Unknown"
+        return (
+            os.path.basename(download.save_path),
+            size_mb,
+            f"{download.progress:.1f}",
+            f"{download.speed:.2f}",
+            f"{download.eta:.0f}",
+            download.status
+        )
 
     def update_table(self):
-        for item in self.table.get_children():
-            download_id = int(self.table.item(item, "text"))
-            if download_id not in self.downloads:
-                self.table.delete(item)
-        for download_id, download in self.downloads.items():
-            exists = False
-            for item in self.table.get_children():
-                if int(self.table.item(item, "text")) == download_id:
-                    exists = True
-                    break
-            filename = os.path.basename(download.save_path)
-            size_mb = f"{download.file_size / (1024 * 1024):.2f}" if download.file_size else "Unknown"
-            values = (
-                filename,
-                size_mb,
-                f"{download.progress:.1f}",
-                f"{download.speed:.2f}",
-                f"{download.eta:.0f}",
-                download.status
-            )
-            if exists:
-                self.table.item(item, values=values)
+        """Refresh only the rows that changed since the last call."""
+        for download_id in set(self._iid_by_id) - set(self.downloads):
+            self.table.delete(self._iid_by_id.pop(download_id))
+        dirty, self._table_dirty = self._table_dirty, set()
+        for download_id in sorted(dirty):
+            download = self.downloads.get(download_id)
+            if download is None:
+                continue
+            values = self.row_values(download)
+            iid = self._iid_by_id.get(download_id)
+            if iid is None:
+                self._iid_by_id[download_id] = self.table.insert("", tk.END, iid=str(download_id), text=str(download_id), values=values)
             else:
-                self.table.insert("", tk.END, text=str(download_id), values=values)
+                self.table.item(iid, values=values)
 
     def update_ui(self):
         self.update_table()
@@ -685,9 +873,13 @@ class AsyncDADAloaderWindow(tk.Tk):
         self.after(200, self.update_ui)
 
 def main():
-    loop = asyncio.get_event_loop()
+    # The asyncio loop runs on its own thread; Tk keeps the main thread
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
     window = AsyncDADAloaderWindow(loop)
     window.mainloop()
+    window.flush_dirty()  # Persist progress still waiting for the next 1 s batch
+    loop.call_soon_threadsafe(loop.stop)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file